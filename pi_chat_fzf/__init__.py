@@ -0,0 +1,25 @@
+"""Fuzzy find and resume Pi coding agent sessions.
+
+The package doubles as a small library for in-process use::
+
+    from pi_chat_fzf import Index
+
+    index = Index()
+    for entry in index.search("rate limiting", limit=5):
+        print(entry.file_path, entry.display)
+"""
+
+from pi_chat_fzf.index import FzfEntry, Index, list_entries, sessions_dir
+from pi_chat_fzf.preview import render_preview
+from pi_chat_fzf.sessions import Message, SessionHeader, parse_messages
+
+__all__ = [
+    "FzfEntry",
+    "Index",
+    "Message",
+    "SessionHeader",
+    "list_entries",
+    "parse_messages",
+    "render_preview",
+    "sessions_dir",
+]
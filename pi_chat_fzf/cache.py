@@ -0,0 +1,301 @@
+"""Persist the fzf feed so warm starts can hand it straight to fzf."""
+
+from __future__ import annotations
+
+import bisect
+import fcntl
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from pi_chat_fzf.index import _format_timestamp, session_entries, sessions_dir
+from pi_chat_fzf.sessions import parse_messages
+
+FEED_FILE = "feed.tsv"
+TABLE_FILE = "sessions.tsv"
+FRESH_FILE = "fresh.tsv"
+SCAN_FILE = "scan.json"
+LOCK_FILE = "lock"
+
+# Appending to a session doesn't touch its directory's mtime, so files that
+# were still being written at the last scan are re-stat'd every time. Older
+# ones are re-stat'd a rotating slice per scan, so a resumed old session is
+# noticed without any one launch stat'ing every file.
+SETTLED_AGE_NS = 24 * 3600 * 10**9
+SWEEP_FILES = 256
+# A directory modified this recently may change again without its mtime moving
+RACY_WINDOW_NS = 2 * 10**9
+
+
+@dataclass
+class SessionRecord:
+    path: str  # kept after the file is gone, so the id stays reserved
+    sort_ts: str  # session start, used to order feed blocks
+
+
+@dataclass
+class ScanState:
+    sweep_after: str = ""  # the next sweep slice starts after this path
+    dirs: dict[str, int] = field(default_factory=dict)  # dir -> mtime_ns, -1 = relist
+
+
+@dataclass
+class FeedSnapshot:
+    feed: Path  # exact bytes fzf reads: session_id\trole\tmsg_index\tdisplay
+    table: Path  # session table, line number = session id
+
+
+def cache_dir() -> Path:
+    """Return the pi-chat-fzf cache directory."""
+    env = os.environ.get("XDG_CACHE_HOME")
+    base = Path(env) if env else Path.home() / ".cache"
+    return base / "pi-chat-fzf"
+
+
+def snapshot_dir(root: Path) -> Path:
+    """Return the cache directory for one sessions root."""
+    digest = hashlib.sha1(str(root).encode()).hexdigest()[:16]
+    return cache_dir() / digest
+
+
+@contextmanager
+def _atomic_open(path: Path) -> Iterator[BinaryIO]:
+    """Write to a temp file next to path and rename it into place on success."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def load_scan_state(path: Path) -> ScanState:
+    """Read the directory mtimes recorded by the previous scan."""
+    try:
+        data = json.loads(path.read_text())
+        return ScanState(sweep_after=str(data["sweep_after"]), dirs=dict(data["dirs"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return ScanState()
+
+
+def save_scan_state(state: ScanState, path: Path) -> None:
+    with _atomic_open(path) as f:
+        f.write(json.dumps({"sweep_after": state.sweep_after, "dirs": state.dirs}).encode())
+
+
+def scan_sessions(
+    root: Path, known: dict[str, tuple[int, int]], state: ScanState
+) -> tuple[dict[str, tuple[int, int]], ScanState]:
+    """Map every session file under root to its (mtime_ns, size).
+
+    known holds the stats from the previous scan and state its directory
+    mtimes. Directories whose mtime hasn't moved are not listed again; their
+    files come from known, and only files modified within SETTLED_AGE_NS of
+    now, plus the next SWEEP_FILES older ones, are re-stat'd. Returns the
+    stats and the state to save for next time.
+    """
+    now_ns = time.time_ns()
+    full = not known
+    settled_before = now_ns - SETTLED_AGE_NS
+
+    settled = sorted(path for path, (mtime_ns, _) in known.items() if mtime_ns < settled_before)
+    start = bisect.bisect_right(settled, state.sweep_after)
+    sweep = settled[start : start + SWEEP_FILES]
+    sweep += settled[: min(start, SWEEP_FILES - len(sweep))]  # wrap around
+    new_state = ScanState(sweep_after=sweep[-1] if sweep else "")
+    swept = set(sweep)
+
+    known_by_dir: dict[str, list[str]] = {}
+    for path in known:
+        known_by_dir.setdefault(os.path.dirname(path), []).append(path)
+    subdirs: dict[str, list[str]] = {}
+    for d in state.dirs:
+        subdirs.setdefault(os.path.dirname(d), []).append(d)
+
+    stats: dict[str, tuple[int, int]] = {}
+
+    def visit(path: str) -> None:
+        prev = known.get(path)
+        if not full and prev is not None and prev[0] < settled_before and path not in swept:
+            stats[path] = prev
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        stats[path] = (st.st_mtime_ns, st.st_size)
+
+    pending = [str(root)]
+    while pending:
+        d = pending.pop()
+        try:
+            dir_mtime = os.stat(d).st_mtime_ns
+        except OSError:
+            continue
+        new_state.dirs[d] = dir_mtime if now_ns - dir_mtime > RACY_WINDOW_NS else -1
+
+        if not full and state.dirs.get(d) == dir_mtime:
+            for path in known_by_dir.get(d, ()):
+                visit(path)
+            pending.extend(subdirs.get(d, ()))
+            continue
+
+        try:
+            with os.scandir(d) as it:
+                children = list(it)
+        except OSError:
+            continue
+        for entry in children:
+            if entry.is_dir(follow_symlinks=False):
+                pending.append(entry.path)
+            elif entry.name.endswith(".jsonl"):
+                visit(entry.path)
+
+    return stats, new_state
+
+
+def load_table(path: Path) -> list[SessionRecord]:
+    """Read a session table written by build_feed(); missing file means empty."""
+    records: list[SessionRecord] = []
+    try:
+        with path.open() as f:
+            for line in f:
+                file_path, sort_ts = line.rstrip("\n").split("\t")
+                records.append(SessionRecord(file_path, sort_ts))
+    except (OSError, ValueError):
+        return []
+    return records
+
+
+def load_fresh(path: Path) -> dict[str, tuple[int, int]]:
+    """Read the (mtime_ns, size) of every session the published feed was built from."""
+    stats: dict[str, tuple[int, int]] = {}
+    try:
+        with path.open() as f:
+            for line in f:
+                file_path, mtime_ns, size = line.rstrip("\n").split("\t")
+                stats[file_path] = (int(mtime_ns), int(size))
+    except (OSError, ValueError):
+        return {}
+    return stats
+
+
+def _feed_blocks(feed: Path) -> dict[int, list[bytes]]:
+    """Group the lines of an existing feed by session id."""
+    blocks: dict[int, list[bytes]] = {}
+    try:
+        with feed.open("rb") as f:
+            for line in f:
+                blocks.setdefault(int(line.split(b"\t", 1)[0]), []).append(line)
+    except (OSError, ValueError):
+        return {}
+    return blocks
+
+
+def _render_block(session_id: int, path: str) -> tuple[str, list[bytes]]:
+    """Parse one session, returning its sort timestamp and its feed lines."""
+    try:
+        header, messages = parse_messages(Path(path))
+    except OSError:
+        return "", []
+    if header is None:
+        return "", []
+
+    entries = sorted(
+        session_entries(session_id, Path(path), header, messages),
+        key=lambda e: (e.sort_key, e.msg_index),
+        reverse=True,
+    )
+    lines = [
+        f"{e.session_id}\t{e.role}\t{e.msg_index}\t{e.display}\n".encode(errors="replace")
+        for e in entries
+    ]
+    return _format_timestamp(header.timestamp)[1], lines
+
+
+def build_feed(
+    snap: Path, stats: dict[str, tuple[int, int]], known: dict[str, tuple[int, int]]
+) -> None:
+    """Rewrite the feed and session table in snap for the given session stats.
+
+    known holds the stats the current feed was built from (load_fresh()).
+    Sessions whose (mtime_ns, size) are unchanged reuse their lines from
+    that feed; only new or changed files are parsed. Ids are append-only so
+    a picker that is still open keeps resolving.
+    """
+    records = load_table(snap / TABLE_FILE)
+    blocks = _feed_blocks(snap / FEED_FILE) if known else {}
+    ids = {r.path: i for i, r in enumerate(records)}
+
+    live: list[int] = []
+    for path in sorted(stats):
+        session_id = ids.get(path)
+        if session_id is None:
+            session_id = len(records)
+            ids[path] = session_id
+            records.append(SessionRecord(path, ""))
+        live.append(session_id)
+
+        if known.get(path) != stats[path]:
+            records[session_id].sort_ts, blocks[session_id] = _render_block(session_id, path)
+
+    order = sorted(live, key=lambda i: (records[i].sort_ts, i), reverse=True)
+    # Table first: it only ever grows, so every id in either feed resolves.
+    # The freshness record goes last: until it's published, the next rebuild
+    # treats this one as not having happened.
+    with _atomic_open(snap / TABLE_FILE) as f:
+        f.writelines(f"{r.path}\t{r.sort_ts}\n".encode() for r in records)
+    with _atomic_open(snap / FEED_FILE) as f:
+        for session_id in order:
+            f.writelines(blocks.get(session_id, ()))
+    with _atomic_open(snap / FRESH_FILE) as f:
+        f.writelines(f"{path}\t{m}\t{n}\n".encode() for path, (m, n) in stats.items())
+
+
+def ensure_feed(root: Path | None = None, wait: bool = False) -> FeedSnapshot:
+    """Return an up-to-date feed snapshot, rebuilding it only if sessions changed.
+
+    A warm start lists only directories that changed and stats only recently
+    modified session files; see scan_sessions().
+
+    Rebuilds are single-flight across processes: while another process holds
+    the lock, the previous snapshot is served as-is, or, if there is none
+    yet or wait is set, this call waits for the lock and then brings the
+    feed up to date itself.
+    """
+    root = root if root is not None else sessions_dir()
+    snap = snapshot_dir(root)
+    snap.mkdir(parents=True, exist_ok=True)
+
+    feed = snap / FEED_FILE
+    snapshot = FeedSnapshot(feed=feed, table=snap / TABLE_FILE)
+
+    with (snap / LOCK_FILE).open("a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            if feed.exists() and not wait:
+                return snapshot
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+        # Temp files are named by pid, so one left by an interrupted rebuild
+        # would never be overwritten; only the lock holder writes them
+        for name in os.listdir(snap):
+            if name.startswith(".") and name.endswith(".tmp"):
+                (snap / name).unlink(missing_ok=True)
+
+        known = load_fresh(snap / FRESH_FILE) if feed.exists() else {}
+        stats, scan = scan_sessions(root, known, load_scan_state(snap / SCAN_FILE))
+        if not feed.exists() or stats != known:
+            build_feed(snap, stats, known)
+        # Only after the feed reflects this scan, or unlisted files would be lost
+        save_scan_state(scan, snap / SCAN_FILE)
+
+    return snapshot
@@ -2,30 +2,27 @@
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import os
 import subprocess
 import sys
+from pathlib import Path
 
-from pi_chat_fzf.index import list_entries
+from pi_chat_fzf.cache import cache_dir, ensure_feed
+from pi_chat_fzf.export import FORMATS, export_sessions
+from pi_chat_fzf.index import SESSION_TABLE_ENV, Index, list_entries, resolve_session
+from pi_chat_fzf.live import LiveReloader, free_port, new_api_key, supports_listen
 from pi_chat_fzf.preview import render_preview
+from pi_chat_fzf.server import SERVER_ENV, SOCKET_MODE, ServerError, SessionServer, request
 from pi_chat_fzf.sessions import session_cwd
 from pi_chat_fzf.shell import SHELLS
 
 VERSION = "0.2.0"
 
 
-def cmd_pick() -> None:
-    """Default command: parse sessions, launch fzf, print result."""
-    entries = list_entries()
-    if not entries:
-        print("No Pi sessions found", file=sys.stderr)
-        sys.exit(1)
-
-    self_cmd = sys.argv[0]
-
-    # Build fzf input: file_path\trole\tmsg_index\tdisplay
-    lines = [f"{e.file_path}\t{e.role}\t{e.msg_index}\t{e.display}" for e in entries]
-
-    fzf_args = [
+def _fzf_args(self_cmd: str) -> list[str]:
+    return [
         "fzf",
         "--delimiter",
         "\t",
@@ -48,34 +45,122 @@ def cmd_pick() -> None:
         "--ansi",
     ]
 
+
+def _fzf_missing() -> None:
+    print("fzf not found — install it: https://github.com/junegunn/fzf", file=sys.stderr)
+    sys.exit(1)
+
+
+def _server_failed(address: str, exc: Exception) -> None:
+    print(f"pi-chat-fzf server {address}: {exc}", file=sys.stderr)
+    sys.exit(1)
+
+
+def _selected_id(stdout: str) -> str:
+    """Return the session id field of fzf's selection, exiting if there is none."""
+    parts = stdout.strip().split("\t", 3)
+    if not parts or not parts[0].isdigit():
+        sys.exit(0)
+    return parts[0]
+
+
+def _pick_from_server(address: str) -> None:
+    """Stream the entry list from a `serve` instance into fzf."""
     try:
-        result = subprocess.run(
-            fzf_args,
-            input="\n".join(lines),
-            capture_output=True,
-            text=True,
+        proc = subprocess.Popen(
+            _fzf_args(sys.argv[0]),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
     except FileNotFoundError:
-        print("fzf not found — install it: https://github.com/junegunn/fzf", file=sys.stderr)
-        sys.exit(1)
+        _fzf_missing()
+        return
 
-    if result.returncode != 0:
+    stdin = proc.stdin
+    assert stdin is not None
+    try:
+        for chunk in request(address, {"cmd": "list"}):
+            stdin.write(chunk)
+    except BrokenPipeError:
+        pass  # fzf exited before the list finished streaming
+    except (OSError, ValueError, ServerError) as exc:
+        proc.kill()
+        _server_failed(address, exc)
+    stdout, _ = proc.communicate()
+
+    if proc.returncode != 0:
         sys.exit(0)
 
-    selected = result.stdout.strip()
-    parts = selected.split("\t", 3)
-    if not parts:
-        sys.exit(0)
+    payload = {"cmd": "session", "session": _selected_id(stdout.decode(errors="replace"))}
+    try:
+        print(b"".join(request(address, payload)).decode(), end="")
+    except (OSError, ValueError, ServerError) as exc:
+        _server_failed(address, exc)
 
-    session_file = parts[0]
-    from pathlib import Path
 
+def cmd_pick() -> None:
+    """Default command: parse sessions, launch fzf, print result."""
+    server = os.environ.get(SERVER_ENV)
+    if server:
+        _pick_from_server(server)
+        return
+
+    # fzf input lines are session_id\trole\tmsg_index\tdisplay, precomputed in
+    # the cache. The preview resolves session ids through the session table.
+    snapshot = ensure_feed()
+    if snapshot.feed.stat().st_size == 0:
+        print("No Pi sessions found", file=sys.stderr)
+        sys.exit(1)
+
+    table_file = str(snapshot.table)
+    args = _fzf_args(sys.argv[0])
+    env = {**os.environ, SESSION_TABLE_ENV: table_file}
+    reloader = None
+    if supports_listen():
+        # fzf listens for reload actions so sessions written while it's open show up
+        port, api_key = free_port(), new_api_key()
+        args.append(f"--listen=127.0.0.1:{port}")
+        env["FZF_API_KEY"] = api_key
+        reloader = LiveReloader(snapshot.feed, port, api_key)
+        reloader.start()
+    try:
+        # fzf reads the feed file directly; nothing is copied through Python
+        with snapshot.feed.open("rb") as feed:
+            result = subprocess.run(args, stdin=feed, capture_output=True, text=True, env=env)
+    except FileNotFoundError:
+        _fzf_missing()
+        return
+    finally:
+        if reloader is not None:
+            reloader.stop()
+            reloader.join()
+
+    if result.returncode == 2:
+        # fzf's own error, e.g. an option this version doesn't know
+        sys.stderr.write(result.stderr)
+        sys.exit(2)
+    if result.returncode != 0:
+        sys.exit(0)
+
+    session_file = resolve_session(_selected_id(result.stdout), table_file)
     cwd = session_cwd(Path(session_file))
     print(f"{session_file}\t{cwd}")
 
 
 def cmd_list() -> None:
     """Output all entries as TSV."""
+    server = os.environ.get(SERVER_ENV)
+    if server:
+        try:
+            for chunk in request(server, {"cmd": "list", "paths": True}):
+                sys.stdout.buffer.write(chunk)
+        except BrokenPipeError:
+            pass  # stdout closed, e.g. piped into head
+        except (OSError, ValueError, ServerError) as exc:
+            _server_failed(server, exc)
+        return
+
     for e in list_entries():
         print(f"{e.file_path}\t{e.role}\t{e.msg_index}\t{e.display}")
 
@@ -83,19 +168,115 @@ def cmd_list() -> None:
 def cmd_preview() -> None:
     """Render conversation preview for fzf's preview pane."""
     if len(sys.argv) < 5:
-        print("Usage: pi-chat-fzf preview <file> <role> <msg_index>", file=sys.stderr)
+        print("Usage: pi-chat-fzf preview <file|session-id> <role> <msg_index>", file=sys.stderr)
         sys.exit(1)
 
-    file_path = sys.argv[2]
     role = sys.argv[3]
     try:
         msg_index = int(sys.argv[4])
     except ValueError:
         msg_index = 0
 
+    server = os.environ.get(SERVER_ENV)
+    if server:
+        payload = {"cmd": "preview", "session": sys.argv[2], "role": role, "index": msg_index}
+        try:
+            for chunk in request(server, payload):
+                sys.stdout.buffer.write(chunk)
+        except (OSError, ValueError, ServerError) as exc:
+            print(f"Preview unavailable: {exc}")
+        return
+
+    file_path = resolve_session(sys.argv[2])
     print(render_preview(file_path, role, msg_index))
 
 
+def cmd_export() -> None:
+    """Export full transcripts for a list of sessions."""
+    parser = argparse.ArgumentParser(
+        prog="pi-chat-fzf export",
+        description="Export full session transcripts. Sessions come from FILE arguments, "
+        "else from --since/--cwd filters, else from stdin (first tab-separated field of "
+        "each line, e.g. `pi-chat-fzf list` output), else all sessions.",
+    )
+    parser.add_argument("files", nargs="*", metavar="FILE", help="session files")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="md")
+    parser.add_argument("--out", type=Path, help="write one file per session into this dir")
+    parser.add_argument("--jobs", "-j", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--since", help="only sessions started at or after this ISO date")
+    parser.add_argument("--cwd", help="only sessions run in this directory or below")
+    args = parser.parse_args(sys.argv[2:])
+
+    paths: list[str] = args.files
+    if not paths and not (args.since or args.cwd) and not sys.stdin.isatty():
+        paths = [
+            resolve_session(line.rstrip("\n").split("\t", 1)[0])
+            for line in sys.stdin
+            if line.strip()
+        ]
+    if not paths:
+        # Filters only need session headers; the workers parse the messages
+        paths = [path for path, _ in Index().iter_sessions(since=args.since, cwd=args.cwd)]
+
+    try:
+        stats = export_sessions(
+            paths, args.format, out_dir=args.out, stream=sys.stdout, jobs=args.jobs
+        )
+    except BrokenPipeError:
+        # stdout closed, e.g. piped into head; keep the flush at exit quiet too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    print(stats.summary(), file=sys.stderr)
+
+
+def _octal_mode(value: str) -> int:
+    try:
+        return int(value, 8)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an octal mode: {value}") from None
+
+
+def cmd_serve() -> None:
+    """Serve a warm index to local clients until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="pi-chat-fzf serve",
+        description="Serve a warm session index on a Unix socket or host:port.",
+    )
+    parser.add_argument(
+        "address",
+        nargs="?",
+        default=str(cache_dir() / "serve.sock"),
+        metavar="ADDR",
+        help="socket path (contains a /), host:port or port (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--mode",
+        type=_octal_mode,
+        default=SOCKET_MODE,
+        help="socket permissions, in octal (default: 660, owner and group)",
+    )
+    parser.add_argument("--group", help="group to hand the socket to, e.g. a team group")
+    args = parser.parse_args(sys.argv[2:])
+
+    address = args.address
+    if "/" in address:
+        Path(address).parent.mkdir(parents=True, exist_ok=True)
+
+    index = Index()
+    print(
+        f"Serving {len(index.sessions)} sessions on {address}\n"
+        f"Point clients at it with: export {SERVER_ENV}={address}",
+        file=sys.stderr,
+    )
+    try:
+        asyncio.run(SessionServer(index).serve(address, mode=args.mode, group=args.group))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Cannot serve on {address}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
 def cmd_init() -> None:
     """Output shell integration code."""
     if len(sys.argv) < 3:
@@ -120,12 +301,17 @@ Usage:
   pi-chat-fzf list               List all entries as TSV
   pi-chat-fzf preview F R N      Show session preview (used by fzf)
   pi-chat-fzf init SHELL         Output shell integration (fish, bash, zsh)
+  pi-chat-fzf export [FILE...]   Export full transcripts (see export --help)
+  pi-chat-fzf serve [ADDR]       Serve a shared index (see serve --help)
   pi-chat-fzf version            Print version
   pi-chat-fzf help               Show this help
 
 Shortcuts:
   Alt+P                     Launch picker (after shell init)
 
+Environment:
+  PI_CHAT_FZF_SERVER        Use a `serve` instance instead of reading sessions
+
 Requires:
   fzf                       https://github.com/junegunn/fzf
   pi                        https://github.com/badlogic/pi-mono""")
@@ -142,6 +328,10 @@ def main() -> None:
                 cmd_list()
             case "init":
                 cmd_init()
+            case "export":
+                cmd_export()
+            case "serve":
+                cmd_serve()
             case "help" | "--help" | "-h":
                 cmd_help()
             case "version" | "--version" | "-v":
@@ -0,0 +1,136 @@
+"""Export full session transcripts, rendered in parallel."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TextIO
+
+from pi_chat_fzf.sessions import parse_messages
+
+FORMATS = {"md": ".md", "txt": ".txt"}
+
+
+@dataclass
+class ExportStats:
+    sessions: int = 0
+    skipped: int = 0  # missing or unparseable session files
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        mb = self.bytes / (1024 * 1024)
+        seconds = max(self.seconds, 1e-6)
+        line = (
+            f"Exported {self.sessions} sessions ({mb:.1f} MB) in {self.seconds:.2f}s"
+            f" — {self.sessions / seconds:.0f} sessions/s, {mb / seconds:.1f} MB/s"
+        )
+        if self.skipped:
+            line += f", skipped {self.skipped}"
+        return line
+
+
+def render_transcript(file_path: str, fmt: str = "md") -> str | None:
+    """Render a whole session, untruncated, as Markdown ("md") or plain text ("txt").
+
+    Returns None if the file can't be read or isn't a Pi session.
+    """
+    try:
+        header, messages = parse_messages(Path(file_path))
+    except (OSError, UnicodeDecodeError):
+        return None
+    if header is None:
+        return None
+
+    lines: list[str] = []
+    if fmt == "md":
+        lines.append(f"# Session {header.id or Path(file_path).stem}")
+        lines.append("")
+        lines.append(f"- **cwd:** `{header.cwd}`")
+        lines.append(f"- **started:** {header.timestamp}")
+        lines.append(f"- **file:** `{file_path}`")
+        for msg in messages:
+            lines.append("")
+            lines.append("## You" if msg.role == "user" else "## Pi")
+            lines.append("")
+            lines.append(msg.text)
+    else:
+        lines.append(f"Session {header.id or Path(file_path).stem}")
+        lines.append(f"cwd: {header.cwd}")
+        lines.append(f"started: {header.timestamp}")
+        lines.append(f"file: {file_path}")
+        for msg in messages:
+            lines.append("")
+            lines.append("YOU:" if msg.role == "user" else "PI:")
+            lines.append(msg.text)
+
+    return "\n".join(lines) + "\n"
+
+
+def _render_job(job: tuple[str, str]) -> str | None:
+    return render_transcript(*job)
+
+
+def _rendered(paths: list[str], fmt: str, jobs: int) -> Iterator[tuple[str, str | None]]:
+    """Yield (path, transcript) in input order, keeping at most 2 * jobs in flight."""
+    if jobs <= 1:
+        for path in paths:
+            yield path, render_transcript(path, fmt)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: deque[tuple[str, Future[str | None]]] = deque()
+        remaining = iter(paths)
+        for path in remaining:
+            pending.append((path, pool.submit(_render_job, (path, fmt))))
+            if len(pending) >= 2 * jobs:
+                break
+        while pending:
+            path, future = pending.popleft()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(_render_job, (next_path, fmt))))
+            yield path, future.result()
+
+
+def export_sessions(
+    paths: Iterable[str],
+    fmt: str = "md",
+    out_dir: Path | None = None,
+    stream: TextIO | None = None,
+    jobs: int | None = None,
+) -> ExportStats:
+    """Render each session and write it out as soon as it's ready.
+
+    With out_dir, each session goes to its own file named after the session
+    file; otherwise transcripts are written to stream one after another.
+    Duplicate paths are exported once.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format: {fmt} (supported: {', '.join(FORMATS)})")
+    unique = list(dict.fromkeys(paths))
+    jobs = jobs if jobs is not None else os.cpu_count() or 1
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    stats = ExportStats()
+    started = time.monotonic()
+    for path, text in _rendered(unique, fmt, min(jobs, len(unique) or 1)):
+        if text is None:
+            stats.skipped += 1
+            continue
+        if out_dir is not None:
+            (out_dir / (Path(path).stem + FORMATS[fmt])).write_text(text, errors="replace")
+        elif stream is not None:
+            if stats.sessions:
+                stream.write("\n---\n\n" if fmt == "md" else "\n\f\n")
+            stream.write(text)
+        stats.sessions += 1
+        stats.bytes += len(text.encode(errors="replace"))
+    stats.seconds = time.monotonic() - started
+    return stats
@@ -3,15 +3,25 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
-from pi_chat_fzf.sessions import parse_messages
+from pi_chat_fzf.preview import render_preview
+from pi_chat_fzf.sessions import (
+    Message,
+    SessionHeader,
+    parse_messages,
+    read_header,
+)
+
+SESSION_TABLE_ENV = "PI_CHAT_FZF_SESSIONS"
 
 
 @dataclass
 class FzfEntry:
+    session_id: int  # row in a session table: Index.sessions or the cache's sessions.tsv
     file_path: str
     role: str  # "user" or "assistant"
     msg_index: int
@@ -46,6 +56,54 @@ def _shorten_home(path: str) -> str:
     return path
 
 
+def _entry_sort_key(e: FzfEntry) -> tuple[str, int]:
+    # Newest first; within same session, summary first then messages by index desc
+    return e.sort_key, e.msg_index
+
+
+def session_entries(
+    session_id: int, path: Path, header: SessionHeader, messages: list[Message]
+) -> Iterator[FzfEntry]:
+    """Yield the summary entry and one entry per message for a parsed session."""
+    # One shared string per session instead of one per message
+    file_path = str(path)
+    short_cwd = _shorten_home(header.cwd)
+    nice_ts, sort_ts = _format_timestamp(header.timestamp)
+
+    # Session summary entry — always appears, uses first user message as summary
+    user_count = sum(1 for m in messages if m.role == "user")
+    first_user = next((m.text for m in messages if m.role == "user"), "")
+    summary_text = " ".join(first_user.split())
+    if len(summary_text) > 120:
+        summary_text = summary_text[:120]
+    summary = f"{nice_ts}  {short_cwd}  │  📋 {user_count} msgs · {summary_text}"
+    yield FzfEntry(
+        session_id=session_id,
+        file_path=file_path,
+        role="summary",
+        msg_index=0,
+        sort_key=sort_ts + "_summary",
+        display=summary,
+    )
+
+    for msg in messages:
+        text = " ".join(msg.text.split())  # flatten whitespace
+        max_len = 150 if msg.role == "assistant" else 200
+        if len(text) > max_len:
+            text = text[:max_len]
+
+        role_tag = "YOU" if msg.role == "user" else "PI"
+        display = f"{nice_ts}  {short_cwd}  │  [{role_tag}] {text}"
+        yield FzfEntry(
+            session_id=session_id,
+            file_path=file_path,
+            role=msg.role,
+            msg_index=msg.index,
+            sort_key=sort_ts,
+            display=display,
+        )
+
+
 def list_entries() -> list[FzfEntry]:
     """Scan all session files and build the fzf entry list.
 
@@ -57,51 +115,197 @@ def list_entries() -> list[FzfEntry]:
         return []
 
     entries: list[FzfEntry] = []
+    session_id = 0
 
     for path in root.rglob("*.jsonl"):
         header, messages = parse_messages(path)
         if header is None:
             continue
 
-        short_cwd = _shorten_home(header.cwd)
-        nice_ts, sort_ts = _format_timestamp(header.timestamp)
-
-        # Session summary entry — always appears, uses first user message as summary
-        user_count = sum(1 for m in messages if m.role == "user")
-        first_user = next((m.text for m in messages if m.role == "user"), "")
-        summary_text = " ".join(first_user.split())
-        if len(summary_text) > 120:
-            summary_text = summary_text[:120]
-        summary = f"{nice_ts}  {short_cwd}  │  📋 {user_count} msgs · {summary_text}"
-        entries.append(
-            FzfEntry(
-                file_path=str(path),
-                role="summary",
-                msg_index=0,
-                sort_key=sort_ts + "_summary",
-                display=summary,
+        entries.extend(session_entries(session_id, path, header, messages))
+        session_id += 1
+
+    entries.sort(key=_entry_sort_key, reverse=True)
+
+    return entries
+
+
+def resolve_session(ref: str, table_file: str | None = None) -> str:
+    """Resolve a session id to its file path via a session table.
+
+    The table defaults to $PI_CHAT_FZF_SESSIONS. Only the first tab-separated
+    field of each table line is used. Anything that isn't a known id is
+    returned unchanged, so plain file paths keep working.
+    """
+    table_file = table_file or os.environ.get(SESSION_TABLE_ENV)
+    if not table_file or not ref.isdigit():
+        return ref
+    try:
+        with open(table_file) as f:
+            for i, line in enumerate(f):
+                if i == int(ref):
+                    return line.rstrip("\n").split("\t", 1)[0]
+    except OSError:
+        pass
+    return ref
+
+
+@dataclass
+class _CachedSession:
+    path: Path
+    mtime_ns: int
+    size: int
+    header: SessionHeader
+    sort_ts: str
+    # Built lazily on first iteration. Only the rendered entries are kept, whose
+    # display text is already truncated, not the full message text.
+    entries: list[FzfEntry] | None = None
+
+
+class Index:
+    """A warm, in-process index over Pi sessions.
+
+    Intended for long-lived Python processes: session files are only
+    re-parsed when their mtime or size changes, and every query is a
+    generator, so callers can stop after the first few results.
+
+    Session ids are assigned on first sight and never reused, so ids handed
+    out before a refresh() keep pointing at the same file.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root if root is not None else sessions_dir()
+        self._table: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._sessions: dict[int, _CachedSession] = {}
+        self.refresh()
+
+    @property
+    def sessions(self) -> list[str]:
+        """The session table: file paths indexed by session id."""
+        return list(self._table)
+
+    def session_path(self, session_id: int) -> str:
+        """Return the file path for a session id."""
+        return self._table[session_id]
+
+    def refresh(self) -> None:
+        """Pick up new, changed and removed session files.
+
+        Only stats files and reads headers of new or changed ones; message
+        parsing is deferred until a query needs it.
+        """
+        seen: set[int] = set()
+        paths = sorted(self.root.rglob("*.jsonl")) if self.root.exists() else []
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            key = str(path)
+            session_id = self._ids.get(key)
+            if session_id is None:
+                session_id = len(self._table)
+                self._table.append(key)
+                self._ids[key] = session_id
+            seen.add(session_id)
+
+            cached = self._sessions.get(session_id)
+            if cached and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+                continue
+
+            header = read_header(path)
+            if header is None:
+                self._sessions.pop(session_id, None)
+                continue
+            self._sessions[session_id] = _CachedSession(
+                path=path,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                header=header,
+                sort_ts=_format_timestamp(header.timestamp)[1],
             )
+
+        for session_id in self._sessions.keys() - seen:
+            del self._sessions[session_id]
+
+    def _matching(
+        self, since: datetime | str | None, cwd: str | None
+    ) -> Iterator[tuple[int, _CachedSession]]:
+        """Yield (session_id, cached) newest first, filtered on header fields only."""
+        since_key = since.isoformat() if isinstance(since, datetime) else since
+        cwd_prefix = os.path.expanduser(cwd).rstrip("/") + "/" if cwd else None
+
+        ordered = sorted(
+            self._sessions.items(), key=lambda item: (item[1].sort_ts, item[0]), reverse=True
         )
+        for session_id, cached in ordered:
+            if since_key is not None and cached.sort_ts < since_key:
+                # Sessions are ordered by start time, nothing older can match
+                break
+            if cwd_prefix is not None and not (cached.header.cwd + "/").startswith(cwd_prefix):
+                continue
+            yield session_id, cached
+
+    def iter_sessions(
+        self, since: datetime | str | None = None, cwd: str | None = None
+    ) -> Iterator[tuple[str, SessionHeader]]:
+        """Yield (file_path, header) per session, newest first, without parsing messages.
+
+        since and cwd filter as in iter_entries().
+        """
+        for _, cached in self._matching(since, cwd):
+            yield str(cached.path), cached.header
 
-        for msg in messages:
-            text = " ".join(msg.text.split())  # flatten whitespace
-            max_len = 150 if msg.role == "assistant" else 200
-            if len(text) > max_len:
-                text = text[:max_len]
-
-            role_tag = "YOU" if msg.role == "user" else "PI"
-            display = f"{nice_ts}  {short_cwd}  │  [{role_tag}] {text}"
-            entries.append(
-                FzfEntry(
-                    file_path=str(path),
-                    role=msg.role,
-                    msg_index=msg.index,
-                    sort_key=sort_ts,
-                    display=display,
+    def iter_entries(
+        self,
+        since: datetime | str | None = None,
+        cwd: str | None = None,
+        roles: Iterable[str] | None = None,
+    ) -> Iterator[FzfEntry]:
+        """Yield entries newest first, in the same order as list_entries().
+
+        since: only sessions started at or after this time (datetime or ISO string).
+        cwd: only sessions whose working directory is cwd or below it.
+        roles: only these entry roles ("summary", "user", "assistant").
+        """
+        role_set = set(roles) if roles is not None else None
+        for session_id, cached in self._matching(since, cwd):
+            if cached.entries is None:
+                try:
+                    header, messages = parse_messages(cached.path)
+                except OSError:
+                    continue  # removed since the last refresh()
+                if header is None:
+                    continue
+                cached.entries = sorted(
+                    session_entries(session_id, cached.path, cached.header, messages),
+                    key=_entry_sort_key,
+                    reverse=True,
                 )
-            )
 
-    # Sort newest first; within same session, summary first then messages by index desc
-    entries.sort(key=lambda e: (e.sort_key, e.msg_index), reverse=True)
+            for e in cached.entries:
+                if role_set is None or e.role in role_set:
+                    yield e
 
-    return entries
+    def search(self, query: str, limit: int | None = None) -> Iterator[FzfEntry]:
+        """Yield entries whose display line contains every word of query.
+
+        Matching is case-insensitive; stops after limit results.
+        """
+        if limit is not None and limit <= 0:
+            return
+        terms = query.lower().split()
+        found = 0
+        for e in self.iter_entries():
+            display = e.display.lower()
+            if all(t in display for t in terms):
+                yield e
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+    def preview(self, session: int | str, role: str, msg_index: int) -> str:
+        """Render the preview pane for a session id or file path."""
+        file_path = self.session_path(session) if isinstance(session, int) else session
+        return render_preview(file_path, role, msg_index)
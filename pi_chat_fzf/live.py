@@ -0,0 +1,128 @@
+"""Keep an open picker in sync with sessions that are still being written."""
+
+from __future__ import annotations
+
+import http.client
+import re
+import secrets
+import shlex
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from pi_chat_fzf.cache import (
+    FRESH_FILE,
+    SCAN_FILE,
+    ensure_feed,
+    load_fresh,
+    load_scan_state,
+    scan_sessions,
+    snapshot_dir,
+)
+from pi_chat_fzf.index import sessions_dir
+
+POLL_INTERVAL = 0.5  # seconds between scans for changed sessions
+QUIET_PERIOD = 1.0  # reload once sessions have been quiet this long...
+MAX_DELAY = 5.0  # ...or at the latest this long after the first change
+# First fzf whose --listen takes ADDR:PORT and checks $FZF_API_KEY
+LISTEN_MIN_VERSION = (0, 43)
+
+
+def fzf_version() -> tuple[int, ...] | None:
+    """Return the installed fzf's version, or None if it can't be determined."""
+    try:
+        out = subprocess.run(["fzf", "--version"], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.match(r"(\d+(?:\.\d+)*)", out.strip())
+    return tuple(int(n) for n in match.group(1).split(".")) if match else None
+
+
+def supports_listen() -> bool:
+    """Whether fzf is new enough to take reload actions from a LiveReloader."""
+    version = fzf_version()
+    return version is not None and version >= LISTEN_MIN_VERSION
+
+
+def free_port() -> int:
+    """Pick an unused localhost port for fzf --listen."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def new_api_key() -> str:
+    """Secret fzf expects in the x-api-key header (passed to it as $FZF_API_KEY)."""
+    return secrets.token_hex(16)
+
+
+class LiveReloader(threading.Thread):
+    """Reload an fzf started with --listen whenever session files change.
+
+    Each poll only stats session files, the same way a warm ensure_feed()
+    does (see scan_sessions()). Changes are debounced, so a session that is
+    streaming output triggers one rebuild and reload per MAX_DELAY instead
+    of one per poll.
+    """
+
+    def __init__(
+        self,
+        feed: Path,
+        port: int,
+        api_key: str,
+        poll_interval: float = POLL_INTERVAL,
+        quiet_period: float = QUIET_PERIOD,
+        max_delay: float = MAX_DELAY,
+        root: Path | None = None,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.feed = feed
+        self.port = port
+        self.api_key = api_key
+        self.root = root if root is not None else sessions_dir()
+        self.poll_interval = poll_interval
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _post(self, action: str) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=2)
+        try:
+            conn.request("POST", "/", body=action.encode(), headers={"x-api-key": self.api_key})
+            conn.getresponse().read()
+        finally:
+            conn.close()
+
+    def run(self) -> None:
+        # Start from what the published feed was built from, so changes made
+        # before this thread got going still count
+        snap = snapshot_dir(self.root)
+        stats, state = load_fresh(snap / FRESH_FILE), load_scan_state(snap / SCAN_FILE)
+        first_change: float | None = None
+        last_change = 0.0
+
+        while not self._stopped.wait(self.poll_interval):
+            seen, state = scan_sessions(self.root, stats, state)
+            now = time.monotonic()
+            if seen != stats:
+                stats = seen
+                last_change = now
+                if first_change is None:
+                    first_change = now
+
+            if first_change is None:
+                continue
+            if now - last_change >= self.quiet_period or now - first_change >= self.max_delay:
+                try:
+                    # Waits out another picker's rebuild rather than reloading
+                    # the feed it's about to replace
+                    ensure_feed(self.root, wait=True)
+                    self._post(f"reload:cat {shlex.quote(str(self.feed))}")
+                except OSError:
+                    continue  # fzf not listening (yet, or anymore); retry next poll
+                first_change = None
@@ -0,0 +1,221 @@
+"""Serve one warm Index to many local clients, and talk to such a server.
+
+The protocol is one JSON request line per connection. The server answers
+with a status line ("ok" or "error <message>") followed by the streamed
+response body, then closes the connection. If the server fails part-way
+through a body it ends it with a NUL byte and "error <message>" instead,
+so the client knows the response is incomplete. Requests:
+
+    {"cmd": "list"}                                  fzf lines, newest first
+    {"cmd": "list", "paths": true}                   same, keyed by file path
+    {"cmd": "query", "query": "...", "limit": 20}    matching fzf lines
+    {"cmd": "preview", "session": 3, "role": "user", "index": 0}
+    {"cmd": "session", "session": 3}                 file_path\tcwd
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import grp
+import json
+import logging
+import os
+import socket
+import stat
+import threading
+import time
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from pi_chat_fzf.index import FzfEntry, Index
+from pi_chat_fzf.sessions import session_cwd
+
+SERVER_ENV = "PI_CHAT_FZF_SERVER"
+SOCKET_MODE = 0o660  # owner and group may connect; connecting needs write access
+REFRESH_INTERVAL = 2.0  # refresh the index at most this often, on demand
+_BATCH = 500  # lines produced per worker-thread hop, and written per drain
+_ERROR_TRAILER = b"\0error "
+
+log = logging.getLogger(__name__)
+
+
+class ServerError(Exception):
+    """The server rejected a request."""
+
+
+def parse_address(address: str) -> str | tuple[str, int]:
+    """Parse a server address: a Unix socket path (contains "/"), host:port or port."""
+    if "/" in address:
+        return address
+    host, _, port = address.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise ValueError(
+            f"invalid address {address!r}: expected a socket path (with a /), host:port or port"
+        ) from None
+
+
+def _line(e: FzfEntry, key: str | int) -> str:
+    return f"{key}\t{e.role}\t{e.msg_index}\t{e.display}\n"
+
+
+class SessionServer:
+    """Answer list, query and preview requests from one shared Index.
+
+    Refreshing and parsing sessions is blocking file I/O, so it runs in
+    worker threads; a lock keeps them from using the Index concurrently.
+    """
+
+    def __init__(self, index: Index) -> None:
+        self.index = index
+        self._refreshed = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._refreshed >= REFRESH_INTERVAL:
+            self.index.refresh()
+            self._refreshed = time.monotonic()
+
+    def _session_path(self, request: dict[str, Any]) -> str:
+        session_id = int(request["session"])
+        if session_id >= 0:
+            with contextlib.suppress(IndexError):
+                return self.index.session_path(session_id)
+        raise ValueError(f"unknown session: {session_id}")
+
+    def respond(self, request: dict[str, Any]) -> Iterator[str]:
+        """Validate a request and return its response body as an iterator of chunks.
+
+        Raises ValueError, KeyError or TypeError for malformed requests.
+        """
+        match request.get("cmd"):
+            case "list":
+                by_path = bool(request.get("paths"))
+                return (
+                    _line(e, e.file_path if by_path else e.session_id)
+                    for e in self.index.iter_entries()
+                )
+            case "query":
+                limit = request.get("limit")
+                hits = self.index.search(
+                    str(request.get("query", "")), int(limit) if limit is not None else None
+                )
+                return (_line(e, e.session_id) for e in hits)
+            case "preview":
+                path = self._session_path(request)
+                role = str(request["role"])
+                text = self.index.preview(path, role, int(request.get("index", 0)))
+                return iter([text + "\n"])
+            case "session":
+                path = self._session_path(request)
+                return iter([f"{path}\t{session_cwd(Path(path))}\n"])
+            case cmd:
+                raise ValueError(f"unknown command: {cmd}")
+
+    def _start(self, request: dict[str, Any]) -> Iterator[str]:
+        with self._lock:
+            self._maybe_refresh()
+            return self.respond(request)
+
+    def _next_batch(self, chunks: Iterator[str]) -> list[str]:
+        # list and query parse sessions lazily, as their generators advance
+        with self._lock:
+            return list(islice(chunks, _BATCH))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection: read the request line, stream the response."""
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                chunks = await asyncio.to_thread(self._start, request)
+            except (ValueError, KeyError, TypeError) as exc:
+                writer.write(f"error {exc}\n".encode())
+                return
+
+            writer.write(b"ok\n")
+            try:
+                while batch := await asyncio.to_thread(self._next_batch, chunks):
+                    if writer.is_closing():
+                        break  # client went away, e.g. fzf closed before the list ended
+                    writer.write("".join(batch).encode(errors="replace"))
+                    # Stops a slow reader making the server buffer everything
+                    await writer.drain()
+            except ConnectionError:
+                raise
+            except Exception as exc:
+                log.exception("%s request failed while streaming", request.get("cmd"))
+                writer.write(_ERROR_TRAILER + f"{exc}\n".encode(errors="replace"))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def serve(self, address: str, mode: int = SOCKET_MODE, group: str | None = None) -> None:
+        """Listen on address until cancelled.
+
+        A Unix socket gets permissions mode and, if given, is handed to group,
+        so other users on the box can connect.
+        """
+        target = parse_address(address)
+        if isinstance(target, str):
+            # Clear a socket left behind by a previous server
+            try:
+                if stat.S_ISSOCK(os.stat(target).st_mode):
+                    os.unlink(target)
+            except FileNotFoundError:
+                pass
+            server = await asyncio.start_unix_server(self.handle, path=target)
+            if group is not None:
+                os.chown(target, -1, grp.getgrnam(group).gr_gid)
+            os.chmod(target, mode)
+        else:
+            server = await asyncio.start_server(self.handle, host=target[0], port=target[1])
+        async with server:
+            await server.serve_forever()
+
+
+def _connect(address: str) -> socket.socket:
+    target = parse_address(address)
+    if isinstance(target, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    return socket.create_connection(target)
+
+
+def request(address: str, payload: dict[str, Any]) -> Iterator[bytes]:
+    """Send one request and yield the response body in chunks as it arrives.
+
+    Raises ServerError if the server rejects the request or fails part-way
+    through it, and OSError if it can't be reached.
+    """
+    with _connect(address) as sock, sock.makefile("rb") as f:
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        status = f.readline().decode(errors="replace").rstrip("\n")
+        if status != "ok":
+            raise ServerError(status.removeprefix("error ") or "connection closed")
+        # Hold back the last line until EOF: it may be the error trailer
+        tail = b""
+        while chunk := f.read1(65536):
+            data = tail + chunk
+            cut = data.rfind(b"\n", 0, len(data) - 1) + 1
+            if cut:
+                yield data[:cut]
+            tail = data[cut:]
+        if tail.startswith(_ERROR_TRAILER):
+            raise ServerError(tail.removeprefix(_ERROR_TRAILER).decode(errors="replace").strip())
+        if tail:
+            yield tail
@@ -107,11 +107,17 @@ def parse_messages(path: Path) -> tuple[SessionHeader | None, list[Message]]:
     return header, messages
 
 
-def session_cwd(path: Path) -> str:
-    """Read just the cwd from a session file header."""
+def read_header(path: Path) -> SessionHeader | None:
+    """Read and parse only the first line of a session file."""
     try:
-        first_line = path.read_text().split("\n", 1)[0]
+        with path.open() as f:
+            first_line = f.readline()
     except OSError:
-        return ""
-    header = parse_header(first_line)
+        return None
+    return parse_header(first_line)
+
+
+def session_cwd(path: Path) -> str:
+    """Read just the cwd from a session file header."""
+    header = read_header(path)
     return header.cwd if header else ""
@@ -0,0 +1,284 @@
+"""Tests for the persisted fzf feed."""
+
+import fcntl
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any
+
+import pytest
+
+from pi_chat_fzf import cache
+from pi_chat_fzf.cache import ensure_feed, load_table
+from pi_chat_fzf.index import list_entries, resolve_session
+from pi_chat_fzf.sessions import Message, SessionHeader
+
+
+@pytest.fixture
+def sessions_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Set up temporary sessions and cache directories."""
+    sessions_dir = tmp_path / "sessions"
+    sessions_dir.mkdir()
+    monkeypatch.setenv("PI_CODING_AGENT_DIR", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return sessions_dir
+
+
+def _copy_fixture(testdata: Path, sessions_dir: Path, name: str) -> None:
+    shutil.copy(testdata / name, sessions_dir / name)
+
+
+def _feed_rows(snapshot: cache.FeedSnapshot) -> list[tuple[str, str, str]]:
+    rows = []
+    for line in snapshot.feed.read_text().splitlines():
+        session_id, role, msg_index, _ = line.split("\t", 3)
+        rows.append((resolve_session(session_id, str(snapshot.table)), role, msg_index))
+    return rows
+
+
+def test_feed_matches_list_entries(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+
+    snapshot = ensure_feed()
+    want = [(e.file_path, e.role, str(e.msg_index)) for e in list_entries()]
+    assert _feed_rows(snapshot) == want
+
+
+def test_warm_start_does_not_parse(
+    testdata: Path, sessions_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    before = ensure_feed().feed.read_bytes()
+
+    def fail(path: Path) -> None:
+        raise AssertionError(f"unexpected parse of {path}")
+
+    monkeypatch.setattr(cache, "parse_messages", fail)
+    assert ensure_feed().feed.read_bytes() == before
+
+
+def test_rebuild_parses_only_changed_sessions(
+    testdata: Path, sessions_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    ensure_feed()
+
+    parsed: list[str] = []
+    real_parse = cache.parse_messages
+
+    def spy(path: Path) -> tuple[SessionHeader | None, list[Message]]:
+        parsed.append(path.name)
+        return real_parse(path)
+
+    monkeypatch.setattr(cache, "parse_messages", spy)
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+    snapshot = ensure_feed()
+
+    assert parsed == ["multi_session.jsonl"]
+    assert {path for path, _, _ in _feed_rows(snapshot)} == {
+        str(sessions_env / "valid_session.jsonl"),
+        str(sessions_env / "multi_session.jsonl"),
+    }
+
+
+def test_removed_session_keeps_ids(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+    snapshot = ensure_feed()
+    table_before = [r.path for r in load_table(snapshot.table)]
+
+    (sessions_env / "valid_session.jsonl").unlink()
+    snapshot = ensure_feed()
+
+    records = load_table(snapshot.table)
+    assert [r.path for r in records] == table_before
+    assert {path for path, _, _ in _feed_rows(snapshot)} == {
+        str(sessions_env / "multi_session.jsonl")
+    }
+
+
+def test_no_sessions_gives_empty_feed(sessions_env: Path) -> None:
+    assert ensure_feed().feed.read_bytes() == b""
+
+
+def _age(path: Path, seconds: int) -> None:
+    """Backdate a file or directory's mtime."""
+    when = time.time() - seconds
+    os.utime(path, (when, when))
+
+
+def _spy_scandir(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    listed: list[str] = []
+    real_scandir = os.scandir
+
+    def spy(path: str) -> Any:
+        listed.append(str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(cache.os, "scandir", spy)
+    return listed
+
+
+def test_warm_start_skips_unchanged_directories(
+    testdata: Path, sessions_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = sessions_env / "--project--"
+    project.mkdir()
+    shutil.copy(testdata / "valid_session.jsonl", project / "a.jsonl")
+    _age(project / "a.jsonl", 3 * 24 * 3600)
+    _age(project, 3600)
+    _age(sessions_env, 3600)
+    ensure_feed()
+
+    listed = _spy_scandir(monkeypatch)
+    ensure_feed()
+    assert listed == []
+
+    # A new session changes the directory mtime, so only that directory is listed
+    shutil.copy(testdata / "multi_session.jsonl", project / "b.jsonl")
+    _age(project, 60)
+    snapshot = ensure_feed()
+    assert listed == [str(project)]
+    assert str(project / "b.jsonl") in {path for path, _, _ in _feed_rows(snapshot)}
+
+
+def test_resumed_old_session_is_found_without_a_full_sweep(
+    testdata: Path, sessions_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cache, "SWEEP_FILES", 2)
+    project = sessions_env / "--project--"
+    project.mkdir()
+    for n in range(5):
+        shutil.copy(testdata / "valid_session.jsonl", project / f"{n}.jsonl")
+        _age(project / f"{n}.jsonl", 3 * 24 * 3600)
+    _age(project, 3 * 24 * 3600)
+    _age(sessions_env, 3 * 24 * 3600)
+    ensure_feed()
+
+    # Resume an old session; its directory mtime doesn't move
+    with (project / "4.jsonl").open("a") as f:
+        f.write('{"type":"message","message":{"role":"user","content":"Resumed"}}\n')
+
+    listed = _spy_scandir(monkeypatch)
+    stated: list[str] = []
+    real_stat = os.stat
+
+    def spy_stat(path: Any, *args: Any, **kwargs: Any) -> os.stat_result:
+        if str(path).endswith(".jsonl"):
+            stated.append(str(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(cache.os, "stat", spy_stat)
+    launches = 0
+    while "Resumed" not in ensure_feed().feed.read_text():
+        launches += 1
+        assert launches <= 3, "resumed session never picked up"
+
+    # Slices [0, 1] and [2, 3] come before the one holding 4.jsonl, and no
+    # launch lists the directory or stats more than a slice
+    assert launches == 2
+    assert listed == []
+    assert len(stated) <= 2 * (launches + 1)
+
+
+def test_append_to_recent_session_is_picked_up(testdata: Path, sessions_env: Path) -> None:
+    path = sessions_env / "valid_session.jsonl"
+    shutil.copy(testdata / "valid_session.jsonl", path)
+    _age(sessions_env, 3600)
+    ensure_feed()
+
+    # Appending doesn't touch the directory mtime
+    with path.open("a") as f:
+        f.write('{"type":"message","message":{"role":"user","content":"Appended later"}}\n')
+    _age(sessions_env, 3600)
+
+    assert "Appended later" in ensure_feed().feed.read_text()
+
+
+def _hold_lock() -> IO[str]:
+    lock = (cache.snapshot_dir(cache.sessions_dir()) / cache.LOCK_FILE).open("a")
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    return lock
+
+
+def test_locked_rebuild_serves_previous_snapshot(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    before = ensure_feed().feed.read_bytes()
+
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+    with _hold_lock():
+        assert ensure_feed().feed.read_bytes() == before
+    assert ensure_feed().feed.read_bytes() != before
+
+
+def test_locked_rebuild_can_wait_for_fresh_feed(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    before = ensure_feed().feed.read_bytes()
+
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+    lock = _hold_lock()
+    threading.Timer(0.2, lock.close).start()
+    assert ensure_feed(wait=True).feed.read_bytes() != before
+
+
+def test_locked_rebuild_without_snapshot_waits(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    cache.snapshot_dir(cache.sessions_dir()).mkdir(parents=True)
+    lock = _hold_lock()
+    threading.Timer(0.2, lock.close).start()
+
+    started = time.monotonic()
+    snapshot = ensure_feed()
+    assert time.monotonic() - started >= 0.2
+    assert snapshot.feed.read_bytes() != b""
+
+
+def test_publish_leaves_no_temp_files(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    snap = ensure_feed().feed.parent
+    assert sorted(p.name for p in snap.iterdir()) == [
+        cache.FEED_FILE,
+        cache.FRESH_FILE,
+        cache.LOCK_FILE,
+        cache.SCAN_FILE,
+        cache.TABLE_FILE,
+    ]
+
+
+def test_interrupted_publish_is_rebuilt(
+    testdata: Path, sessions_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    ensure_feed()
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+
+    # Die after the table is published but before the feed is
+    real_atomic_open = cache._atomic_open
+
+    def crash_on_feed(path: Path) -> Any:
+        if path.name == cache.FEED_FILE:
+            raise KeyboardInterrupt
+        return real_atomic_open(path)
+
+    monkeypatch.setattr(cache, "_atomic_open", crash_on_feed)
+    with pytest.raises(KeyboardInterrupt):
+        ensure_feed()
+    monkeypatch.undo()
+    monkeypatch.setenv("PI_CODING_AGENT_DIR", str(sessions_env.parent))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(sessions_env.parent / "cache"))
+
+    snapshot = ensure_feed()
+    assert str(sessions_env / "multi_session.jsonl") in {p for p, _, _ in _feed_rows(snapshot)}
+
+
+def test_leftover_temp_files_are_removed(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    snap = ensure_feed().feed.parent
+    leftover = snap / f".{cache.FEED_FILE}.99999.tmp"
+    leftover.write_bytes(b"partial")
+
+    ensure_feed()
+    assert not leftover.exists()
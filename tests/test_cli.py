@@ -1,6 +1,7 @@
 """Tests for CLI subcommands."""
 
 import subprocess
+from pathlib import Path
 
 
 def test_version() -> None:
@@ -41,3 +42,16 @@ def test_init_unknown_shell() -> None:
     )
     assert result.returncode != 0
     assert "Unknown shell" in result.stderr
+
+
+def test_export_reads_plain_paths_from_stdin(testdata: Path) -> None:
+    session = testdata / "valid_session.jsonl"
+    result = subprocess.run(
+        ["uv", "run", "pi-chat-fzf", "export", "--format", "txt", "--jobs", "1"],
+        input=f"{session}\n",
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    assert f"file: {session}\n" in result.stdout
+    assert "Exported 1 sessions" in result.stderr
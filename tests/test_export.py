@@ -0,0 +1,68 @@
+"""Tests for transcript export."""
+
+import io
+import json
+from pathlib import Path
+
+from pi_chat_fzf.export import export_sessions, render_transcript
+
+
+def test_transcript_markdown(testdata: Path) -> None:
+    text = render_transcript(str(testdata / "valid_session.jsonl"), "md")
+    assert text is not None
+    assert text.startswith("# Session test-session-001")
+    assert "`/Users/test/projects/myapp`" in text
+    assert text.count("## You") == 3
+    assert text.count("## Pi") == 2
+    assert "Fix the login bug in auth.ts" in text
+
+
+def test_transcript_plain_text(testdata: Path) -> None:
+    text = render_transcript(str(testdata / "valid_session.jsonl"), "txt")
+    assert text is not None
+    assert "YOU:\nFix the login bug in auth.ts" in text
+    assert "##" not in text
+
+
+def test_transcript_is_not_truncated(tmp_path: Path) -> None:
+    long_text = "word " * 1000
+    path = tmp_path / "long.jsonl"
+    header = {"type": "session", "id": "long", "timestamp": "2025-12-01T10:30:00.000Z"}
+    message = {"type": "message", "message": {"role": "user", "content": long_text}}
+    path.write_text(json.dumps(header) + "\n" + json.dumps(message) + "\n")
+
+    text = render_transcript(str(path))
+    assert text is not None
+    assert long_text.strip() in text
+
+
+def test_transcript_missing_file() -> None:
+    assert render_transcript("/nonexistent/file.jsonl") is None
+
+
+def test_export_to_stream_skips_bad_and_duplicate(testdata: Path) -> None:
+    valid = str(testdata / "valid_session.jsonl")
+    multi = str(testdata / "multi_session.jsonl")
+    out = io.StringIO()
+
+    stats = export_sessions([valid, "/nonexistent/file.jsonl", multi, valid], stream=out, jobs=1)
+
+    assert stats.sessions == 2
+    assert stats.skipped == 1
+    assert stats.bytes == len(out.getvalue().encode()) - len("\n---\n\n")
+    # Input order is preserved
+    assert out.getvalue().index("test-session-001") < out.getvalue().index("test-session-004")
+    assert "Exported 2 sessions" in stats.summary()
+
+
+def test_export_to_dir_in_parallel(testdata: Path, tmp_path: Path) -> None:
+    names = ["valid_session", "multi_session", "assistant_has_keywords", "no_text_content"]
+    paths = [str(testdata / f"{name}.jsonl") for name in names]
+
+    stats = export_sessions(paths, "txt", out_dir=tmp_path / "out", jobs=2)
+
+    assert stats.sessions == 4
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(
+        f"{name}.txt" for name in names
+    )
+    assert "IKKEGOL" in (tmp_path / "out" / "assistant_has_keywords.txt").read_text()
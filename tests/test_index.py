@@ -5,7 +5,12 @@ from pathlib import Path
 
 import pytest
 
-from pi_chat_fzf.index import list_entries
+from pi_chat_fzf.index import (
+    SESSION_TABLE_ENV,
+    Index,
+    list_entries,
+    resolve_session,
+)
 
 
 @pytest.fixture
@@ -105,3 +110,95 @@ def test_list_entries_role_tags(testdata: Path, sessions_env: Path) -> None:
         assert "[YOU]" in e.display
     for e in assistant_entries:
         assert "[PI]" in e.display
+
+
+def test_resolve_session_via_table(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Same layout as the cache's sessions.tsv: path, start time
+    table_file = tmp_path / "sessions.tsv"
+    table_file.write_text("/a/one.jsonl\t2025-12-01\n/b/two.jsonl\t2025-12-02\n")
+    monkeypatch.setenv(SESSION_TABLE_ENV, str(table_file))
+
+    assert resolve_session("1") == "/b/two.jsonl"
+    # Unknown ids and plain paths pass through unchanged
+    assert resolve_session("7") == "7"
+    assert resolve_session("/c/three.jsonl") == "/c/three.jsonl"
+
+
+def test_index_matches_list_entries(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+
+    index = Index()
+    got = [(e.file_path, e.role, e.msg_index) for e in index.iter_entries()]
+    want = [(e.file_path, e.role, e.msg_index) for e in list_entries()]
+    assert got == want
+
+
+def test_index_filters(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+    index = Index()
+
+    assert {e.role for e in index.iter_entries(roles=["summary"])} == {"summary"}
+    myapp = list(index.iter_entries(cwd="/Users/test/projects/myapp"))
+    assert myapp
+    assert all(e.file_path.endswith("valid_session.jsonl") for e in myapp)
+    # multi_session started Dec 5, valid_session Dec 1
+    recent = list(index.iter_entries(since="2025-12-03"))
+    assert recent
+    assert all(e.file_path.endswith("multi_session.jsonl") for e in recent)
+
+
+def test_index_search_limit(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "assistant_has_keywords.jsonl")
+    index = Index()
+
+    hits = list(index.search("ikkegol"))
+    assert hits
+    assert all("IKKEGOL" in e.display for e in hits)
+    assert len(list(index.search("", limit=2))) == 2
+
+
+def test_index_refresh_keeps_ids(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    index = Index()
+    first = index.sessions[0]
+
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+    (sessions_env / "valid_session.jsonl").unlink()
+    index.refresh()
+
+    assert index.session_path(0) == first
+    assert {e.session_id for e in index.iter_entries()} == {1}
+    assert "Cannot open" in index.preview(0, "user", 0)
+    assert "← ← ←" in index.preview(1, "user", 0)
+
+
+def test_index_keeps_only_rendered_entries(testdata: Path, sessions_env: Path) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    index = Index()
+    list(index.iter_entries())
+
+    (cached,) = index._sessions.values()
+    assert not hasattr(cached, "messages")
+    assert cached.entries is not None
+    assert len(cached.entries) == 6
+
+
+def test_index_iter_sessions_reads_headers_only(
+    testdata: Path, sessions_env: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _copy_fixture(testdata, sessions_env, "valid_session.jsonl")
+    _copy_fixture(testdata, sessions_env, "multi_session.jsonl")
+    index = Index()
+
+    def no_parse(path: Path) -> None:
+        raise AssertionError(f"parsed {path}")
+
+    monkeypatch.setattr("pi_chat_fzf.index.parse_messages", no_parse)
+    names = [Path(path).name for path, _ in index.iter_sessions()]
+    assert names == ["multi_session.jsonl", "valid_session.jsonl"]
+    myapp = list(index.iter_sessions(cwd="/Users/test/projects/myapp"))
+    assert [header.cwd for _, header in myapp] == ["/Users/test/projects/myapp"]
+    recent = list(index.iter_sessions(since="2025-12-03"))
+    assert [Path(path).name for path, _ in recent] == ["multi_session.jsonl"]
@@ -0,0 +1,195 @@
+"""Tests for live reloading of an open picker."""
+
+import fcntl
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+from pi_chat_fzf.cache import LOCK_FILE, ensure_feed, snapshot_dir
+from pi_chat_fzf.index import sessions_dir
+from pi_chat_fzf.live import LiveReloader, fzf_version, supports_listen
+
+APPENDED = '{"type":"message","message":{"role":"user","content":"More work"}}\n'
+
+
+@pytest.fixture
+def session_file(testdata: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    sessions_dir = tmp_path / "sessions"
+    sessions_dir.mkdir()
+    monkeypatch.setenv("PI_CODING_AGENT_DIR", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = sessions_dir / "valid_session.jsonl"
+    shutil.copy(testdata / "valid_session.jsonl", path)
+    return path
+
+
+@pytest.fixture
+def fake_fzf() -> Iterator[tuple[int, list[tuple[str, str]]]]:
+    """A stand-in for fzf --listen recording (action, api key) for each POST."""
+    posts: list[tuple[str, str]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+            posts.append((body, self.headers.get("x-api-key", "")))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], posts
+    server.shutdown()
+
+
+def _wait_for(posts: list, count: int, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while len(posts) < count and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+def test_burst_of_appends_reloads_once(
+    session_file: Path, fake_fzf: tuple[int, list[tuple[str, str]]]
+) -> None:
+    port, posts = fake_fzf
+    feed = ensure_feed().feed
+    reloader = LiveReloader(feed, port, "secret", poll_interval=0.05, quiet_period=0.3)
+    reloader.start()
+    try:
+        for _ in range(3):
+            with session_file.open("a") as f:
+                f.write(APPENDED)
+            time.sleep(0.1)
+        _wait_for(posts, 1)
+        time.sleep(0.4)
+    finally:
+        reloader.stop()
+
+    assert len(posts) == 1
+    action, api_key = posts[0]
+    assert action == f"reload:cat {feed}"
+    assert api_key == "secret"
+    assert "More work" in feed.read_text()
+
+
+def test_continuous_writes_reload_within_max_delay(
+    session_file: Path, fake_fzf: tuple[int, list[tuple[str, str]]]
+) -> None:
+    port, posts = fake_fzf
+    reloader = LiveReloader(
+        ensure_feed().feed, port, "secret", poll_interval=0.05, quiet_period=10, max_delay=0.3
+    )
+    reloader.start()
+    try:
+        deadline = time.monotonic() + 1.0
+        while time.monotonic() < deadline and not posts:
+            with session_file.open("a") as f:
+                f.write(APPENDED)
+            time.sleep(0.05)
+    finally:
+        reloader.stop()
+
+    assert posts
+
+
+def test_no_changes_no_reload(
+    session_file: Path, fake_fzf: tuple[int, list[tuple[str, str]]]
+) -> None:
+    port, posts = fake_fzf
+    reloader = LiveReloader(ensure_feed().feed, port, "secret", poll_interval=0.05)
+    reloader.start()
+    time.sleep(0.3)
+    reloader.stop()
+
+    assert posts == []
+
+
+@pytest.mark.parametrize(
+    ("output", "version", "listens"),
+    [
+        ("0.44.1 (brew)\n", (0, 44, 1), True),
+        ("0.43.0 (d579e33)\n", (0, 43, 0), True),
+        ("0.38.0 (debian)\n", (0, 38, 0), False),
+        ("", None, False),
+    ],
+)
+def test_fzf_version_gates_listen(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    output: str,
+    version: tuple[int, ...] | None,
+    listens: bool,
+) -> None:
+    fzf = tmp_path / "fzf"
+    fzf.write_text(f"#!/bin/sh\nprintf '{output}'\n")
+    fzf.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    assert fzf_version() == version
+    assert supports_listen() is listens
+
+
+def test_missing_fzf_does_not_listen(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PATH", str(tmp_path))
+    assert fzf_version() is None
+    assert not supports_listen()
+
+
+def test_polls_do_not_rebuild_the_feed(
+    session_file: Path, fake_fzf: tuple[int, list[tuple[str, str]]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    port, posts = fake_fzf
+    builds: list[Path | None] = []
+    monkeypatch.setattr(
+        "pi_chat_fzf.live.ensure_feed", lambda root=None, wait=False: builds.append(root)
+    )
+    feed = ensure_feed().feed
+    reloader = LiveReloader(feed, port, "secret", poll_interval=0.02, quiet_period=0.2)
+    reloader.start()
+    try:
+        time.sleep(0.2)
+        assert builds == []
+        with session_file.open("a") as f:
+            f.write(APPENDED)
+        _wait_for(posts, 1)
+    finally:
+        reloader.stop()
+        reloader.join()
+
+    assert len(builds) == 1
+    assert len(posts) == 1
+
+
+def test_reload_waits_for_another_pickers_rebuild(
+    session_file: Path, fake_fzf: tuple[int, list[tuple[str, str]]]
+) -> None:
+    port, posts = fake_fzf
+    feed = ensure_feed().feed
+    reloader = LiveReloader(feed, port, "secret", poll_interval=0.02, quiet_period=0.1)
+    reloader.start()
+    lock = (snapshot_dir(sessions_dir()) / LOCK_FILE).open("a")
+    try:
+        # Another picker holds the lock across the whole debounce
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        with session_file.open("a") as f:
+            f.write(APPENDED)
+        time.sleep(0.4)
+        assert posts == []
+        lock.close()
+
+        _wait_for(posts, 1)
+    finally:
+        lock.close()
+        reloader.stop()
+        reloader.join()
+
+    assert len(posts) == 1
+    assert "More work" in feed.read_text()
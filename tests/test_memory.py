@@ -0,0 +1,191 @@
+"""Peak-allocation budgets for the hot paths, measured with tracemalloc.
+
+Budgets are per 10k indexed messages or per MB of session data, with
+roughly 2x headroom over what the current code needs. When one is
+exceeded the failure lists the top allocation sites still alive at the
+end of the call.
+"""
+
+import json
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pi_chat_fzf.cache import ensure_feed
+from pi_chat_fzf.index import list_entries
+from pi_chat_fzf.preview import render_preview
+from pi_chat_fzf.sessions import parse_messages
+
+pytestmark = pytest.mark.memory
+
+SESSIONS = 50
+MESSAGES_PER_SESSION = 100
+MB = 1024 * 1024
+
+WORDS = [
+    "fix",
+    "the",
+    "login",
+    "bug",
+    "in",
+    "auth",
+    "rate",
+    "limiting",
+    "deploy",
+    "staging",
+    "database",
+    "migration",
+]
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Generate SESSIONS sessions of MESSAGES_PER_SESSION ~400-byte messages."""
+    root = tmp_path_factory.mktemp("agent")
+    project = root / "sessions" / "--home-test-project--"
+    project.mkdir(parents=True)
+
+    rng = random.Random(0)
+    for s in range(SESSIONS):
+        header = {
+            "type": "session",
+            "version": 1,
+            "id": f"session-{s}",
+            "timestamp": f"2025-12-{1 + s % 28:02d}T10:{s % 60:02d}:00.000Z",
+            "cwd": "/home/test/project",
+        }
+        lines = [json.dumps(header)]
+        for m in range(MESSAGES_PER_SESSION):
+            text = " ".join(rng.choice(WORDS) for _ in range(60))
+            role = "user" if m % 2 == 0 else "assistant"
+            message = {"role": role, "content": [{"type": "text", "text": text}]}
+            lines.append(json.dumps({"type": "message", "message": message}))
+        (project / f"{s:04d}.jsonl").write_text("\n".join(lines) + "\n")
+    return root
+
+
+@pytest.fixture
+def corpus_env(corpus: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("PI_CODING_AGENT_DIR", str(corpus))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return corpus / "sessions"
+
+
+def _corpus_mb(sessions: Path) -> float:
+    return sum(p.stat().st_size for p in sessions.rglob("*.jsonl")) / MB
+
+
+def _snapshot_at_peak(fn: Callable[[], Any], step: int) -> tracemalloc.Snapshot | None:
+    """Re-run fn, snapshotting whenever traced memory grows step bytes past its high mark.
+
+    The last snapshot shows what was allocated at (about) the peak, rather
+    than what is left once fn has returned.
+    """
+    high = 0
+    snapshot: tracemalloc.Snapshot | None = None
+
+    def sample(frame: Any, event: str, arg: Any) -> None:
+        nonlocal high, snapshot
+        current, _ = tracemalloc.get_traced_memory()
+        if current > high + step:
+            high = current
+            snapshot = None  # release the previous one before taking the next
+            snapshot = tracemalloc.take_snapshot()
+
+    tracemalloc.start()
+    sys.setprofile(sample)
+    try:
+        result = fn()
+    finally:
+        sys.setprofile(None)
+        tracemalloc.stop()
+    del result
+    return snapshot
+
+
+def _assert_peak_within(fn: Callable[[], Any], budget: float, label: str) -> None:
+    """Run fn under tracemalloc and fail with the allocation sites at its peak if over budget."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    if peak <= budget:
+        return
+    snapshot = _snapshot_at_peak(fn, step=max(peak // 50, 64 * 1024))
+    sites = "  (no snapshot taken)"
+    if snapshot is not None:
+        top = snapshot.filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<*>")]
+        ).statistics("lineno")[:10]
+        sites = "\n".join(f"  {stat}" for stat in top)
+    pytest.fail(
+        f"{label}: peak {peak / MB:.2f} MB exceeds budget {budget / MB:.2f} MB\n"
+        f"top allocation sites at peak:\n{sites}"
+    )
+
+
+def test_report_shows_sites_at_peak() -> None:
+    def allocate_then_free() -> None:
+        chunks = [bytes(1024) for _ in range(2048)]  # ~2 MB, gone before returning
+        del chunks
+
+    with pytest.raises(pytest.fail.Exception) as excinfo:
+        _assert_peak_within(allocate_then_free, 1 * MB, "probe")
+    top_site = str(excinfo.value).split("at peak:\n", 1)[1].splitlines()[0]
+    assert "test_memory.py" in top_site
+    assert "KiB" in top_site or "MiB" in top_site
+
+
+def test_list_entries_budget(corpus_env: Path) -> None:
+    messages = SESSIONS * MESSAGES_PER_SESSION
+    _assert_peak_within(list_entries, 16 * MB * messages / 10_000, "list_entries")
+
+
+def test_parse_messages_budget(corpus_env: Path) -> None:
+    path = next(corpus_env.rglob("*.jsonl"))
+    size_mb = path.stat().st_size / MB
+    _assert_peak_within(lambda: parse_messages(path), 6 * MB * size_mb, "parse_messages")
+
+
+def test_render_preview_budget(corpus_env: Path) -> None:
+    path = next(corpus_env.rglob("*.jsonl"))
+    size_mb = path.stat().st_size / MB
+    _assert_peak_within(
+        lambda: render_preview(str(path), "user", 10), 12 * MB * size_mb, "render_preview"
+    )
+
+
+def test_feed_build_budget(corpus_env: Path) -> None:
+    budget = 1.5 * MB * _corpus_mb(corpus_env)
+    _assert_peak_within(ensure_feed, budget, "feed build (cold)")
+
+
+def test_feed_warm_start_budget(corpus_env: Path) -> None:
+    ensure_feed()
+    messages = SESSIONS * MESSAGES_PER_SESSION
+    _assert_peak_within(ensure_feed, 0.5 * MB * messages / 10_000, "feed (warm)")
+
+
+def test_feed_incremental_rebuild_budget(corpus_env: Path) -> None:
+    snapshot = ensure_feed()
+    feed_mb = snapshot.feed.stat().st_size / MB
+
+    # Rebuilding after one session changes re-reads the whole previous feed
+    path = next(corpus_env.rglob("*.jsonl"))
+    original = path.read_bytes()
+    try:
+        with path.open("a") as f:
+            f.write('{"type":"message","message":{"role":"user","content":"one more"}}\n')
+        _assert_peak_within(ensure_feed, 2.5 * MB * feed_mb, "feed build (incremental)")
+        assert "one more" in snapshot.feed.read_text()
+    finally:
+        path.write_bytes(original)
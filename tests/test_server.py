@@ -0,0 +1,154 @@
+"""Tests for the shared-index server and its client."""
+
+import asyncio
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from pi_chat_fzf.index import FzfEntry, Index
+from pi_chat_fzf.server import (
+    SOCKET_MODE,
+    ServerError,
+    SessionServer,
+    parse_address,
+    request,
+)
+
+
+async def _shutdown() -> None:
+    tasks = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.get_running_loop().shutdown_default_executor()
+
+
+@contextmanager
+def _serving(index: Index) -> Iterator[tuple[str, threading.Thread]]:
+    """Serve index on a Unix socket from an event loop in a background thread."""
+    # Unix socket paths are length-limited, so keep this one short
+    with tempfile.TemporaryDirectory(dir="/tmp") as sock_dir:
+        address = f"{sock_dir}/serve.sock"
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        asyncio.run_coroutine_threadsafe(SessionServer(index).serve(address), loop)
+        deadline = time.monotonic() + 5
+        while not Path(address).exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        yield address, thread
+
+        asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+@pytest.fixture
+def index(testdata: Path, tmp_path: Path) -> Index:
+    """An Index over the valid and multi session fixtures."""
+    root = tmp_path / "sessions"
+    root.mkdir()
+    for name in ("valid_session.jsonl", "multi_session.jsonl"):
+        shutil.copy(testdata / name, root / name)
+    return Index(root)
+
+
+@pytest.fixture
+def server_address(index: Index) -> Iterator[str]:
+    with _serving(index) as (address, _):
+        yield address
+
+
+def _text(address: str, payload: dict) -> str:
+    return b"".join(request(address, payload)).decode()
+
+
+def test_parse_address() -> None:
+    assert parse_address("/tmp/pi.sock") == "/tmp/pi.sock"
+    assert parse_address("0.0.0.0:7717") == ("0.0.0.0", 7717)
+    assert parse_address("7717") == ("127.0.0.1", 7717)
+
+
+def test_parse_address_rejects_garbage() -> None:
+    for address in ("foo.sock", "host:"):
+        with pytest.raises(ValueError, match="invalid address"):
+            parse_address(address)
+
+
+def test_socket_is_group_connectable(server_address: str) -> None:
+    assert stat.S_IMODE(os.stat(server_address).st_mode) == SOCKET_MODE == 0o660
+
+
+def test_list_streams_fzf_lines(server_address: str) -> None:
+    lines = _text(server_address, {"cmd": "list"}).splitlines()
+    # 1 summary + 5 messages for valid_session, 1 summary + 3 messages for multi_session
+    assert len(lines) == 10
+    assert all(line.split("\t", 1)[0].isdigit() for line in lines)
+
+    by_path = _text(server_address, {"cmd": "list", "paths": True}).splitlines()
+    assert by_path[0].split("\t", 1)[0].endswith("multi_session.jsonl")
+
+
+def test_query_and_preview(server_address: str) -> None:
+    hits = _text(server_address, {"cmd": "query", "query": "login", "limit": 1}).splitlines()
+    assert len(hits) == 1
+    session_id, role, msg_index, display = hits[0].split("\t", 3)
+    assert "login" in display.lower()
+
+    payload = {"cmd": "preview", "session": session_id, "role": role, "index": int(msg_index)}
+    preview = _text(server_address, payload)
+    assert "← ← ←" in preview
+    assert "Fix the login bug" in preview
+
+    path, cwd = _text(server_address, {"cmd": "session", "session": session_id}).split("\t")
+    assert path.endswith("valid_session.jsonl")
+    assert cwd.strip() == "/Users/test/projects/myapp"
+
+
+def test_bad_requests_are_rejected(server_address: str) -> None:
+    with pytest.raises(ServerError, match="unknown command"):
+        _text(server_address, {"cmd": "nope"})
+    with pytest.raises(ServerError, match="unknown session"):
+        _text(server_address, {"cmd": "session", "session": 99})
+
+
+def test_index_work_runs_off_the_event_loop(index: Index, monkeypatch: pytest.MonkeyPatch) -> None:
+    threads: list[threading.Thread] = []
+    real_iter_entries = index.iter_entries
+
+    def spy(*args: object, **kwargs: object) -> Iterator[FzfEntry]:
+        threads.append(threading.current_thread())
+        yield from real_iter_entries(*args, **kwargs)
+
+    monkeypatch.setattr(index, "iter_entries", spy)
+    with _serving(index) as (address, loop_thread):
+        assert len(_text(address, {"cmd": "list"}).splitlines()) == 10
+    assert threads
+    assert loop_thread not in threads
+
+
+def test_failure_mid_stream_is_reported(index: Index, monkeypatch: pytest.MonkeyPatch) -> None:
+    real_iter_entries = index.iter_entries
+
+    def failing(*args: object, **kwargs: object) -> Iterator[FzfEntry]:
+        entries = real_iter_entries(*args, **kwargs)
+        yield next(entries)
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(index, "iter_entries", failing)
+    with _serving(index) as (address, _):
+        received: list[bytes] = []
+        with pytest.raises(ServerError, match="disk on fire"):
+            for chunk in request(address, {"cmd": "list"}):
+                received.append(chunk)
+    assert b"\0" not in b"".join(received)